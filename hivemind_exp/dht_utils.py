@@ -1,4 +1,9 @@
 import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
 from functools import lru_cache
 from typing import Any
 
@@ -19,14 +24,18 @@ REWARDS_KEY = "rl_swarm_rewards"  # Subkey = Metric. Everyone publishes.
 OUTPUTS_KEY_PREFIX = "rl_swarm_outputs"  # Subkey = Example Hash. Everyone publishes.
 
 
+# Key builders are memoized; rounds and stages change rarely.
+@lru_cache(maxsize=256)
 def leaderboard_key(round_num, stage) -> str:
     return f"{LEADERBOARD_KEY_PREFIX}_{round_num}_{stage}"
 
 
+@lru_cache(maxsize=256)
 def rewards_key(round_num, stage) -> str:
     return f"{REWARDS_KEY}_{round_num}_{stage}"
 
 
+@lru_cache(maxsize=2048)
 def outputs_key(node_key: str, round_num, stage) -> str:
     return f"{OUTPUTS_KEY_PREFIX}_{node_key}_{round_num}_{stage}"
 
@@ -35,35 +44,86 @@ def node_outputs_key(node: HivemindNode) -> str:
     return outputs_key(node.key, node.round_num, node.stage_num)
 
 
+# Keys published by current trainers are MD5 hex digests of the question.
+_is_md5_hex = re.compile(r"\A[0-9a-f]{32}\Z").match
+
+
+# Copying an empty digest skips per-call constructor setup.
+_MD5_EMPTY = hashlib.md5()
+
+
+def md5_hex(data: bytes) -> str:
+    h = _MD5_EMPTY.copy()
+    h.update(data)
+    return h.hexdigest()
+
+
+def md5_batch(data: list[bytes]) -> list[str]:
+    """Hex MD5 digests of every entry in data, in order."""
+    return [md5_hex(b) for b in data]
+
+
 def hash_keys(outputs):
     # Handles older versions of the trainer that did not hash question keys.
-    result = {}
-    for k, v in outputs.items():
-        if len(k) != 32:  # Not perfect, but good enough.
-            k = hashlib.md5(k.encode()).hexdigest()
-        result[k] = v
+    unhashed = [k for k in outputs if not _is_md5_hex(k)]
+    if not unhashed:
+        return dict(outputs)
 
-    return result
+    digests = dict(zip(unhashed, md5_batch([k.encode() for k in unhashed])))
+    return {digests.get(k, k): v for k, v in outputs.items()}
 
 
-@lru_cache
-def get_outputs(
-    dht: DHT, node_key: str, r, s, get_cached_fn=None
-) -> dict[str, tuple[float, dict]]:  # Q: (timestamp, outputs)
+def _fetch_outputs(dht: DHT, node_key: str, r, s, get_cached_fn=None):
     # Try provided cache function first.
     if get_cached_fn:
         if outputs := get_cached_fn(r, s):
-            return hash_keys(outputs)
+            return outputs
 
     # Try from DHT next to include peered outputs.
     if outputs := get_dht_value(dht, key=outputs_key(node_key, r, s), latest=False):
-        return hash_keys(outputs)
+        return outputs
 
     raise ValueError(
         f"could not retrieve stage outputs for {node_key} at round {r} stage {s}"
     )
 
 
+# (dht, node_key, r, s, get_cached_fn): (insert time, outputs). Least recent first.
+_outputs_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+_outputs_cache_lock = threading.RLock()
+OUTPUTS_CACHE_SIZE = 1024
+OUTPUTS_CACHE_TTL = 300  # seconds
+
+
+def clear_outputs_cache():
+    with _outputs_cache_lock:
+        _outputs_cache.clear()
+
+
+def get_outputs(
+    dht: DHT, node_key: str, r, s, get_cached_fn=None
+) -> dict[str, tuple[float, dict]]:  # Q: (timestamp, outputs)
+    # The DHT and cache function stay in the key: local and peered outputs can differ.
+    key = (dht, node_key, r, s, get_cached_fn)
+    with _outputs_cache_lock:
+        if entry := _outputs_cache.get(key):
+            cached_time, outputs = entry
+            if time.monotonic() - cached_time < OUTPUTS_CACHE_TTL:
+                _outputs_cache.move_to_end(key)
+                return outputs
+            del _outputs_cache[key]
+
+    # Cache the hashed outputs so hits skip hash_keys entirely.
+    outputs = hash_keys(_fetch_outputs(dht, node_key, r, s, get_cached_fn))
+    with _outputs_cache_lock:
+        _outputs_cache[key] = (time.monotonic(), outputs)
+        _outputs_cache.move_to_end(key)
+        while len(_outputs_cache) > OUTPUTS_CACHE_SIZE:
+            _outputs_cache.popitem(last=False)
+
+    return outputs
+
+
 def get_round_and_stage(
     dht: DHT,
 ) -> tuple[int, int]:
@@ -76,13 +136,36 @@ def get_round_and_stage(
 
 
 def get_dht_value(dht: DHT, **kwargs) -> Any | None:
-    wrapper = dht.get(**kwargs)
+    return unwrap_dht_value(dht.get(**kwargs))
+
+
+def unwrap_dht_value(wrapper: ValueWithExpiration | None) -> Any | None:
+    """Unwraps a raw dht.get result, e.g. one resolved from a return_future call."""
     if not wrapper:
         return None
 
     assert isinstance(wrapper, ValueWithExpiration)
     value = wrapper.value
     if isinstance(value, dict):
-        # Subkeys exist; unwrap ValueWithExpiration.
-        return {k: v.value for k, v in value.items()}
+        # Subkeys exist; unwrap ValueWithExpiration on access.
+        return _LazyUnwrapMapping(value)
     return value
+
+
+class _LazyUnwrapMapping(Mapping):
+    """Read-only view of subkey values that unwraps ValueWithExpiration lazily."""
+
+    def __init__(self, wrapped: dict[Any, ValueWithExpiration]):
+        self._wrapped = wrapped
+
+    def __getitem__(self, key):
+        return self._wrapped[key].value
+
+    def __iter__(self):
+        return iter(self._wrapped)
+
+    def __len__(self):
+        return len(self._wrapped)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
@@ -1,7 +1,12 @@
+import heapq
 import logging
 import time
-from collections import defaultdict
-from typing import Sequence
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any, Sequence
+
+import numpy as np
 
 import hivemind_exp.gsm8k.stage1_rewards as stage1_rewards
 import hivemind_exp.gsm8k.stage2_rewards as stage2_rewards
@@ -30,6 +35,7 @@ def merged_prev_stage_datasets(
     merge_fn,
     samples_fn,
     dht_sample_limit = 200,
+    dht_fetch_workers: int = 16,
     check_interval: float = 5,
     wait_timeout: float = 10,
     log_tag=None,
@@ -39,70 +45,81 @@ def merged_prev_stage_datasets(
 
     logger = logging.getLogger(f"{__name__}:{log_tag}")
 
-    merged_qs = []
-
     # Retrieves and merges last stage samples locally and from DHT.
     def get_prev_rewards():
         return get_dht_value(
             dht, key=rewards_key(r, s - 1), beam_size=100
         )
 
-    prev_rewards: dict[str, Any] | None = get_prev_rewards()
+    prev_rewards: Mapping[str, Any] | None = get_prev_rewards()
     start_time = time.monotonic()
-    while not prev_rewards and time.monotonic() - start_time < wait_timeout:
+    # The DHT has no watch primitive; back off from a short delay up to check_interval.
+    delay = min(0.25, check_interval)
+    while not prev_rewards and (
+        remaining := wait_timeout - (time.monotonic() - start_time)
+    ) > 0:
         logger.info(
-            f"Can't retrieve round {r} stage {s - 1} rewards; trying again in {check_interval}s "
+            f"Can't retrieve round {r} stage {s - 1} rewards; trying again in {delay}s "
         )
-        time.sleep(check_interval)
+        time.sleep(min(delay, remaining))
         prev_rewards = get_prev_rewards()
+        delay = min(delay * 2, check_interval)
 
-    # Add the current node's local samples first.
-    prev_items: dict[str, list] = defaultdict(list)
+    # Group samples by question hash, starting with the current node's local samples.
+    q_to_keyed_items: dict[str, dict[str, Any]] = {}
     try:
         prev_node_outputs = get_outputs(dht, node.key, r, s - 1, node.get_stage_outputs)
-        for item in prev_node_outputs.items():
-            prev_items[node.key].append(item)
+        for q_hash, (_, outputs) in prev_node_outputs.items():
+            q_to_keyed_items.setdefault(q_hash, {})[node.key] = outputs
     except ValueError:
         # Joined after the round has started.
         logger.info(f"Could not retrieve local outputs for round {r} stage {s - 1}")
 
     # Add other nodes' samples iff rewards are available.
+    node_keys = []
     if prev_rewards:
-        node_keys = prev_rewards.keys()
-        dht_sample_count = 0
-        for node_key in node_keys:
-            if dht_sample_count > dht_sample_limit:
-                break
+        node_keys = [k for k in prev_rewards.keys() if k != node.key]
+    if node_keys:
 
-            if node_key == node.key:
-                continue
+        def fetch_node_outputs(node_key):
             try:
-                prev_node_outputs = get_outputs(dht, node_key, r, s - 1)
-                for item in prev_node_outputs.items():
-                    prev_items[node_key].append(item)
-
-                    dht_sample_count += 1
-                    if dht_sample_count > dht_sample_limit:
-                        break
-
+                return get_outputs(dht, node_key, r, s - 1)
             except ValueError:
                 # Skip this node's answers for the current round and stage.
                 logger.debug(
                     f"Found rewards published for node: {node_key} but no outputs!"
                 )
+                return None
 
-    # Group samples by question hash.
-    q_to_keyed_items: dict[str, dict[str, Any]] = defaultdict(dict)
-    for node_key, items in prev_items.items():
-        for item in items:
-            q_hash, (_, outputs) = item
-            q_to_keyed_items[q_hash][node_key] = outputs
+        dht_sample_count = 0
+        with ThreadPoolExecutor(max_workers=dht_fetch_workers) as executor:
+            # Fetch in batches so no lookups are issued once the limit is reached.
+            for i in range(0, len(node_keys), dht_fetch_workers):
+                if dht_sample_count > dht_sample_limit:
+                    break
+
+                batch = node_keys[i : i + dht_fetch_workers]
+                for node_key, prev_node_outputs in zip(
+                    batch, executor.map(fetch_node_outputs, batch)
+                ):
+                    if dht_sample_count > dht_sample_limit:
+                        break
 
-    # Merge sample lists.
-    for outputs in q_to_keyed_items.values():
-        merged = merge_fn(outputs)
-        merged_qs.append(merged)
+                    if prev_node_outputs is None:
+                        continue
+                    for q_hash, (_, outputs) in prev_node_outputs.items():
+                        q_to_keyed_items.setdefault(q_hash, {})[node_key] = outputs
+
+                        dht_sample_count += 1
+                        if dht_sample_count > dht_sample_limit:
+                            break
 
+    if not q_to_keyed_items:
+        # Nothing local or peered to merge.
+        return samples_fn([])
+
+    # Merge sample lists.
+    merged_qs = [merge_fn(outputs) for outputs in q_to_keyed_items.values()]
     return samples_fn(merged_qs)
 
 
@@ -158,7 +175,10 @@ def gsm8k_stage_data(
             check_interval=check_interval,
             log_tag=log_tag,
         )
-        rewards = defaultdict(float)
+        # Dense index per node (first seen order) + one reward increment per output.
+        node_indices: dict[str, int] = {}
+        indices: list[int] = []
+        increments: list[float] = []
         for outputs in final_stage_outputs:
             for node_key, output in outputs.items():
                 prompts = [
@@ -169,11 +189,20 @@ def gsm8k_stage_data(
                 ]
                 final_answer = next(iter(output["final_agent_decision"].items()))[1]
                 completions = [[{"role": "assistant", "content": final_answer}]]
+                # Only count rewards produced by this call.
+                node.rewards = []
                 cumulative_reward_2(prompts=prompts, completions=completions, **output)
-                rewards[node_key] += sum(node.rewards)
+                indices.append(node_indices.setdefault(node_key, len(node_indices)))
+                increments.append(sum(node.rewards))
 
-        rewards = sorted(list(rewards.items()), key=lambda x: x[1], reverse=True)
-        return [n for n, _ in rewards][:limit]
+        rewards = np.bincount(
+            np.asarray(indices, dtype=np.intp),
+            weights=np.asarray(increments, dtype=np.float64),
+            minlength=len(node_indices),
+        )
+        # Same order as a stable descending sort, without sorting every node.
+        top = heapq.nlargest(limit, zip(node_indices, rewards), key=itemgetter(1))
+        return [n for n, _ in top]
 
     return StageData(
         round_winner_fn=round_winners,
@@ -1,4 +1,5 @@
 import logging
+import os
 
 import colorlog
 from trl import GRPOConfig, ModelConfig, TrlParser
@@ -17,6 +18,12 @@ from hivemind_exp.runner.grpo_runner import GRPOArguments, GRPORunner
 
 
 def main():
+    # Must be set before the first CUDA allocation; grows segments in place instead
+    # of fragmenting the caching allocator during the first steps of a round.
+    os.environ.setdefault(
+        "PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True,max_split_size_mb:512"
+    )
+
     # Setup logging.
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any, Callable, Sequence
 
@@ -17,7 +16,7 @@ class HivemindNode:
     outputs: dict[Any, Any] = field(default_factory=dict)
     # Cache for (r, s): Q: (timestamp, outputs).
     round_cache: dict[tuple[int, int], dict[str, tuple[float, dict]]] = field(
-        default_factory=lambda: defaultdict(dict)
+        default_factory=dict
     )
 
     # Reward outputs from the last training.
@@ -28,18 +27,18 @@ class HivemindNode:
     stage_num: int = 0
 
     out_expiration: int = 60 * 60 * 4  # hours
+    # Number of top nodes published to the leaderboard.
+    leaderboard_size: int = 200
 
     @staticmethod
     def coordinator(*args, **kwargs):
         return HivemindNode(*args, **kwargs, is_coordinator=True)
 
     def get_stage_outputs(self, r, s) -> dict[str, tuple[float, dict]] | None:
-        key = (r, s)
-        if key in self.round_cache:
-            return self.round_cache[key]
+        return self.round_cache.get((r, s))
 
     def put_stage_outputs(self, r, s, question, value: tuple[float, dict]):
-        self.round_cache[(r, s)][question] = value
+        self.round_cache.setdefault((r, s), {})[question] = value
 
     def clear_stage_cache(self):
         self.round_cache.clear()
@@ -78,7 +78,8 @@ def hex_to_ints(s, k):
 # libp2p peer IDs are always base58-encoded multihashes!
 
 
-@lru_cache
+# Pure function of the peer ID; large enough to hold every peer the UI sees.
+@lru_cache(maxsize=200_000)
 def get_name_from_peer_id(peer_id: str, no_spaces=False):
     # ~200 entries for both lists; so 2 hex digits.
     ints = hex_to_ints(hashlib.md5(peer_id.encode()).hexdigest(), 2)
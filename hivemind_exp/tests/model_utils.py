@@ -0,0 +1,16 @@
+from copy import deepcopy
+from functools import cache
+
+from transformers import AutoModelForCausalLM
+
+TEST_MODEL_NAME = "trl-internal-testing/tiny-Qwen2ForCausalLM-2.5"
+
+
+@cache
+def _load_base_model():
+    return AutoModelForCausalLM.from_pretrained(TEST_MODEL_NAME)
+
+
+def load_test_model():
+    # Loaded once per test session; trainers mutate weights, so hand out copies.
+    return deepcopy(_load_base_model())
@@ -0,0 +1,121 @@
+from collections.abc import Mapping
+
+import pytest
+from hivemind.utils import ValueWithExpiration
+
+from hivemind_exp import dht_utils
+from hivemind_exp.dht_utils import (
+    OUTPUTS_CACHE_TTL,
+    clear_outputs_cache,
+    get_outputs,
+    unwrap_dht_value,
+)
+from hivemind_exp.tests.fake_data import CK, QUESTION, QUESTION_HASH
+
+DHT = object()  # Only used as part of the cache key.
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(dht_utils.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    # (r, s) for every uncached lookup.
+    calls = []
+
+    def fetch_outputs(dht, node_key, r, s, get_cached_fn=None):
+        calls.append((r, s))
+        return {QUESTION: (float(r), {"question": QUESTION})}
+
+    monkeypatch.setattr(dht_utils, "_fetch_outputs", fetch_outputs)
+    clear_outputs_cache()
+    yield calls
+    clear_outputs_cache()
+
+
+def test_get_outputs_cache_hit(fetches, clock):
+    outputs = get_outputs(DHT, CK, 0, 0)
+    assert outputs == {QUESTION_HASH: (0.0, {"question": QUESTION})}
+    assert get_outputs(DHT, CK, 0, 0) is outputs
+    assert fetches == [(0, 0)]
+
+
+def test_get_outputs_cache_ttl(fetches, clock):
+    get_outputs(DHT, CK, 0, 0)
+    clock[0] += OUTPUTS_CACHE_TTL - 1
+    get_outputs(DHT, CK, 0, 0)
+    assert fetches == [(0, 0)]
+
+    clock[0] += 1
+    get_outputs(DHT, CK, 0, 0)
+    assert fetches == [(0, 0), (0, 0)]
+
+
+def test_get_outputs_cache_eviction(fetches, clock, monkeypatch):
+    monkeypatch.setattr(dht_utils, "OUTPUTS_CACHE_SIZE", 2)
+    for r in range(3):
+        get_outputs(DHT, CK, r, 0)
+
+    get_outputs(DHT, CK, 2, 0)
+    get_outputs(DHT, CK, 0, 0)  # Least recently used, so evicted.
+    assert fetches == [(0, 0), (1, 0), (2, 0), (0, 0)]
+
+
+def test_get_outputs_cache_hit_refreshes_recency(fetches, clock, monkeypatch):
+    monkeypatch.setattr(dht_utils, "OUTPUTS_CACHE_SIZE", 2)
+    get_outputs(DHT, CK, 0, 0)
+    get_outputs(DHT, CK, 1, 0)
+    get_outputs(DHT, CK, 0, 0)  # Hit moves round 0 ahead of round 1.
+    get_outputs(DHT, CK, 2, 0)
+
+    get_outputs(DHT, CK, 0, 0)
+    get_outputs(DHT, CK, 1, 0)
+    assert fetches == [(0, 0), (1, 0), (2, 0), (1, 0)]
+
+
+def test_clear_outputs_cache(fetches, clock):
+    get_outputs(DHT, CK, 0, 0)
+    clear_outputs_cache()
+    get_outputs(DHT, CK, 0, 0)
+    assert fetches == [(0, 0), (0, 0)]
+
+
+def test_get_outputs_errors_not_cached(fetches, clock, monkeypatch):
+    def missing_outputs(dht, node_key, r, s, get_cached_fn=None):
+        fetches.append((r, s))
+        raise ValueError("missing")
+
+    with monkeypatch.context() as m:
+        m.setattr(dht_utils, "_fetch_outputs", missing_outputs)
+        with pytest.raises(ValueError, match="missing"):
+            get_outputs(DHT, CK, 0, 0)
+
+    assert get_outputs(DHT, CK, 0, 0)
+    assert fetches == [(0, 0), (0, 0)]
+
+
+def test_unwrap_dht_value():
+    assert unwrap_dht_value(None) is None
+    assert unwrap_dht_value(ValueWithExpiration((0, 1), 10.0)) == (0, 1)
+
+    value = unwrap_dht_value(
+        ValueWithExpiration(
+            {
+                "a": ValueWithExpiration(1.0, 10.0),
+                "b": ValueWithExpiration(2.0, 11.0),
+            },
+            11.0,
+        )
+    )
+    # Subkeyed values are a read-only view, not a dict.
+    assert isinstance(value, Mapping) and not isinstance(value, dict)
+    assert value["a"] == 1.0
+    assert value.get("c") is None
+    assert list(value) == ["a", "b"]
+    assert len(value) == 2
+    assert value == {"a": 1.0, "b": 2.0}
+    assert dict(value) == {"a": 1.0, "b": 2.0}
@@ -9,7 +9,7 @@ import pytest
 from datasets import Dataset
 from hivemind.dht import DHT
 from hivemind.utils import get_dht_time
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoTokenizer
 from trl import GRPOConfig
 
 from hivemind_exp.dht_utils import ROUND_STAGE_NUMBER_KEY, outputs_key
@@ -33,16 +33,15 @@ from hivemind_exp.tests.fake_data import (
     STAGE_2_OUTPUTS,
     samples_with_key,
 )
+from hivemind_exp.tests.model_utils import TEST_MODEL_NAME, load_test_model
 from hivemind_exp.trainer.hivemind_grpo_trainer import (
     HivemindGRPOTrainer,
     get_dht_value,
 )
 
-TEST_MODEL_NAME = "trl-internal-testing/tiny-Qwen2ForCausalLM-2.5"
-
 
 def get_model_config(tmp_path):
-    model = AutoModelForCausalLM.from_pretrained(TEST_MODEL_NAME)
+    model = load_test_model()
     config = GRPOConfig(
         output_dir=tmp_path,
         learning_rate=5e-7,
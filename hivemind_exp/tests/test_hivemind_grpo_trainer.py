@@ -1,12 +1,13 @@
-import itertools
 import math
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
 
+import datasets
 import hivemind
 import pytest
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoTokenizer
 from trl import GRPOConfig
 
 from hivemind_exp.dht_utils import (
@@ -17,6 +18,8 @@ from hivemind_exp.dht_utils import (
 )
 from hivemind_exp.hivemind_utils import SingleStageData, StageData
 from hivemind_exp.tests.fake_data import CK, QUESTION, QUESTION_HASH, RSK, SAMPLES
+from hivemind_exp.tests.model_utils import TEST_MODEL_NAME, load_test_model
+from hivemind_exp.trainer.gensyn.testnet_grpo_trainer import TestnetGRPOTrainer
 from hivemind_exp.trainer.hivemind_grpo_trainer import (
     HivemindGRPOTrainer,
     get_dht_value,
@@ -34,11 +37,8 @@ def dummy_reward_func(node: HivemindNode, prompts, completions, **kwargs) -> lis
     return rewards
 
 
-TEST_MODEL_NAME = "trl-internal-testing/tiny-Qwen2ForCausalLM-2.5"
-
-
 def get_model_config(tmp_path, max_steps):
-    model = AutoModelForCausalLM.from_pretrained(TEST_MODEL_NAME)
+    model = load_test_model()
     config = GRPOConfig(
         output_dir=tmp_path,
         learning_rate=5e-7,
@@ -65,6 +65,106 @@ def create_dht_and_trainer(tmp_path, node, stage_data, max_steps=1, initial_peer
 
 
 
+################
+# CONTROL FLOW #
+################
+
+# These stub out training to check which rounds a follower runs.
+
+
+def create_stub_trainer(
+    round_and_stage=(0, 0), trainer_cls=HivemindGRPOTrainer, **kwargs
+):
+    trainer = trainer_cls(
+        dht=None,  # type: ignore
+        node=HivemindNode("test", "0"),
+        model=None,
+        tokenizer=SimpleNamespace(pad_token="<pad>"),
+        config=SimpleNamespace(output_dir="out"),  # type: ignore
+        stage_data=None,  # type: ignore
+        **kwargs,
+    )
+    calls = []
+    trainer.train_stages = lambda r, s, is_coordinator: calls.append(
+        ("train_stages", r, s, is_coordinator)
+    )
+    trainer.cleanup = lambda: calls.append(("cleanup",))
+    trainer.get_round_and_stage = lambda: round_and_stage
+    return trainer, calls
+
+
+def test_catch_up_train_runs_every_round():
+    trainer, calls = create_stub_trainer()
+    trainer.catch_up_train(start_round=1, end_round=3)
+    assert [c for c in calls if c[0] == "train_stages"] == [
+        ("train_stages", 1, 0, False),
+        ("train_stages", 2, 0, False),
+        ("train_stages", 3, 0, False),
+    ]
+
+
+def test_catch_up_train_defaults_to_previous_round():
+    trainer, calls = create_stub_trainer(round_and_stage=(3, 1))
+    trainer.catch_up_train()
+    assert [c[1] for c in calls if c[0] == "train_stages"] == [0, 1, 2]
+
+
+def test_catch_up_train_skips_dataset_errors():
+    trainer, calls = create_stub_trainer()
+
+    def train_stages(r, s, is_coordinator):
+        calls.append(("train_stages", r))
+        if r == 1:
+            raise datasets.exceptions.DatasetGenerationError("no data")
+
+    trainer.train_stages = train_stages
+    trainer.catch_up_train(start_round=0, end_round=2)
+    assert calls == [
+        ("train_stages", 0),
+        ("cleanup",),
+        ("train_stages", 1),
+        ("train_stages", 2),
+        ("cleanup",),
+    ]
+
+
+def test_catch_up_train_stops_on_other_errors():
+    trainer, calls = create_stub_trainer()
+
+    def train_stages(r, s, is_coordinator):
+        calls.append(("train_stages", r))
+        if r == 1:
+            raise RuntimeError("boom")
+
+    trainer.train_stages = train_stages
+    trainer.catch_up_train(start_round=0, end_round=3)
+    assert calls == [("train_stages", 0), ("cleanup",), ("train_stages", 1)]
+
+
+@pytest.mark.parametrize(
+    "trainer_cls, train_fn, kwargs",
+    [
+        (HivemindGRPOTrainer, "train", {}),
+        (TestnetGRPOTrainer, "_train", {"coordinator": None}),
+    ],
+)
+@pytest.mark.parametrize("curr_round, catch_up_calls", [(0, []), (2, [(0, 1)])])
+def test_follower_train_after_catch_up(
+    trainer_cls, train_fn, kwargs, curr_round, catch_up_calls
+):
+    trainer, calls = create_stub_trainer(
+        round_and_stage=(curr_round, 0), trainer_cls=trainer_cls, **kwargs
+    )
+    trainer.catch_up_train = lambda start_round, end_round: calls.append(
+        ("catch_up_train", start_round, end_round)
+    )
+    trainer.follower_train = lambda: calls.append(("follower_train",))
+    getattr(trainer, train_fn)()
+    assert calls == [("catch_up_train", *rs) for rs in catch_up_calls] + [
+        ("follower_train",)
+    ]
+
+
 ###############
 # SINGLE NODE #
 ###############
@@ -164,6 +264,10 @@ def test_single_node_multi_stage(tmp_path):
 
 # These will actually check DHT outputs / rewards / leaderboard.
 
+# (round, stage) pairs checked after training.
+SINGLE_STAGE_RS = ((0, 0),)
+MULTI_STAGE_RS = ((0, 0), (0, 1), (0, 2))
+
 # TODO: Fix flakiness for below tests.
 
 def test_multi_node_single_stage(tmp_path):
@@ -206,7 +310,7 @@ def test_multi_node_single_stage(tmp_path):
     rs = get_dht_value(dht0, key=RSK, latest=True)
     assert rs == (max_rounds - 1, 0)
 
-    for r, s in itertools.product([0], [0]):
+    for r, s in SINGLE_STAGE_RS:
         outputs = get_dht_value(dht0, key=outputs_key(node0.key, r, s), latest=True)
         assert outputs
         assert outputs[QUESTION_HASH][1] == {"question": QUESTION}
@@ -289,7 +393,7 @@ def test_multi_node_multi_stage(tmp_path):
         "merged_1": max_rounds * 2,
     }
 
-    for r, s in itertools.product(range(1), range(3)):
+    for r, s in MULTI_STAGE_RS:
         outputs = get_dht_value(dht0, key=outputs_key(node0.key, r, s), latest=False)
         assert outputs
         assert outputs[QUESTION_HASH][1] == {"question": QUESTION}
@@ -1,8 +1,11 @@
 import gc
-import hashlib
+import heapq
+import itertools
 import logging
+import random
 import time
 import traceback
+from collections.abc import Mapping
 from typing import Any
 
 import datasets
@@ -14,9 +17,11 @@ from trl import GRPOConfig, GRPOTrainer
 from hivemind_exp.debug_utils import print_system_info
 from hivemind_exp.dht_utils import (
     ROUND_STAGE_NUMBER_KEY,
+    clear_outputs_cache,
     get_dht_value,
     get_round_and_stage,
     leaderboard_key,
+    md5_hex,
     node_outputs_key,
     rewards_key,
 )
@@ -24,6 +29,9 @@ from hivemind_exp.hivemind_utils import HivemindNode, StageData
 from hivemind_exp.name_utils import get_name_from_peer_id
 
 MAX_TRAIN_FAILS = 5
+MADDRS_REFRESH_INTERVAL = 60  # seconds
+# Release cached CUDA blocks only below this fraction of free device memory.
+CUDA_FREE_MEMORY_THRESHOLD = 0.15
 
 class HivemindGRPOTrainer:
     """
@@ -31,6 +39,8 @@ class HivemindGRPOTrainer:
     intermediate results to a connected Hivemind DHT.
     """
 
+    round_stage_ttl = 1.0  # seconds
+
     class PublishingGRPOTrainer(GRPOTrainer):
         def __init__(
             self,
@@ -44,25 +54,36 @@ class HivemindGRPOTrainer:
             self.dht = dht
             self.logger = logger
             self.stage_rewards = 0.0
+            # Rewards behind the last published leaderboard for this stage.
+            self.leaderboard_rewards: dict[str, Any] = {}
             super().__init__(processing_class=tokenizer, **kwargs)
 
-        def publish_leaderboard(self):
+        def publish_leaderboard(self, expiration_time=None):
+            if expiration_time is None:
+                expiration_time = get_dht_time() + self.node.out_expiration
+
             r, s = self.node.round_num, self.node.stage_num
-            curr_rewards: dict[str, Any] | None = get_dht_value(
+            curr_rewards: Mapping[str, Any] | None = get_dht_value(
                 self.dht, key=rewards_key(r, s), latest=True
             )
             if curr_rewards:
-                # Sorted list of (node_key, reward) pairs.
-                leaderboard = list(
-                    sorted(
-                        curr_rewards.items(), key=lambda t: (t[1], t[0]), reverse=True
-                    )
+                curr_rewards = dict(curr_rewards)
+                if curr_rewards == self.leaderboard_rewards:
+                    return  # Already published.
+
+                # Sorted list of the top (node_key, reward) pairs.
+                leaderboard = heapq.nlargest(
+                    self.node.leaderboard_size,
+                    curr_rewards.items(),
+                    key=lambda t: (t[1], t[0]),
                 )
-                self.dht.store(
+                if self.dht.store(
                     key=leaderboard_key(r, s),
                     value=leaderboard,
-                    expiration_time=get_dht_time() + self.node.out_expiration,
-                )
+                    expiration_time=expiration_time,
+                ):
+                    # Failed stores are retried on the next step.
+                    self.leaderboard_rewards = curr_rewards
             else:
                 self.logger.info(f"Can't retrieve round {r} stage {s - 1} rewards")
 
@@ -72,29 +93,41 @@ class HivemindGRPOTrainer:
             # This is only here to publish to the DHT at the right time.
             # Only publish to DHT every N steps
             question = self.node.outputs["question"]
-            q_hash = hashlib.md5(question.encode()).hexdigest()
+            q_hash = md5_hex(question.encode())
+            expiration_time = get_dht_time() + self.node.out_expiration
 
+            # Outputs and rewards stores are independent; dispatch both before waiting.
             value = (time.time(), self.node.outputs)
-            self.dht.store(
-                key=node_outputs_key(self.node),
-                subkey=q_hash,
-                value=value,
-                expiration_time=get_dht_time() + self.node.out_expiration,
-            )
+            futures = [
+                self.dht.store(
+                    key=node_outputs_key(self.node),
+                    subkey=q_hash,
+                    value=value,
+                    expiration_time=expiration_time,
+                    return_future=True,
+                )
+            ]
             self.node.put_stage_outputs(
                 self.node.round_num, self.node.stage_num, q_hash, value
             )
 
             # Just the latest.
             self.stage_rewards += sum(self.node.rewards)
-            self.dht.store(
-                key=rewards_key(self.node.round_num, self.node.stage_num),
-                subkey=self.node.key,
-                value=self.stage_rewards,
-                expiration_time=get_dht_time() + self.node.out_expiration,
+            futures.append(
+                self.dht.store(
+                    key=rewards_key(self.node.round_num, self.node.stage_num),
+                    subkey=self.node.key,
+                    value=self.stage_rewards,
+                    expiration_time=expiration_time,
+                    return_future=True,
+                )
             )
+            for future in futures:
+                future.result()
+
+            # Leaderboard reads the rewards just stored, so it goes last.
             if self.node.is_coordinator:
-                self.publish_leaderboard()
+                self.publish_leaderboard(expiration_time)
 
             return loss
 
@@ -128,6 +161,10 @@ class HivemindGRPOTrainer:
 
         self.logger = logging.getLogger(f"{__name__}: {log_tag}")
 
+        # (fetch time, (round, stage)) from the last get_round_and_stage call.
+        self._round_stage: tuple[float, tuple[int, int]] | None = None
+        self._last_maddrs_fetch = float("-inf")
+
     def wait_for(self, result_fn=lambda: None, interval=10, timeout=30):
         start_time = time.monotonic()
         while time.monotonic() - start_time < timeout:
@@ -140,8 +177,9 @@ class HivemindGRPOTrainer:
 
     def train_stages(self, round_num, start_stage, is_coordinator):
         self.node.round_num = round_num
-        for i, stage in enumerate(self.stage_data.stages[start_stage:]):
-            stage_num = start_stage + i
+        for stage_num, stage in enumerate(
+            itertools.islice(self.stage_data.stages, start_stage, None), start_stage
+        ):
             self.node.stage_num = stage_num
 
             if is_coordinator:
@@ -150,6 +188,7 @@ class HivemindGRPOTrainer:
                     value=(self.node.round_num, stage_num),
                     expiration_time=get_dht_time() + self.node.out_expiration,
                 )
+                self._round_stage = None
 
             self.logger.info(f"📈 Training round: {round_num} stage: {stage_num}")
             train_dataset, test_dataset = stage.datasets_fn(round_num, stage_num)
@@ -187,9 +226,11 @@ class HivemindGRPOTrainer:
 
         self.cleanup()
 
-    def cleanup(self):
+    def cleanup(self, force=False):
         gc.collect()
-        if torch.cuda.is_available():
+        # Keep the caching allocator's pool unless memory is tight; re-growing it
+        # through cudaMalloc costs more than reusing cached blocks.
+        if torch.cuda.is_available() and (force or self._cuda_memory_pressured()):
             torch.cuda.empty_cache()
             torch.cuda.ipc_collect()
         if torch.backends.mps.is_available():  # type: ignore
@@ -200,6 +241,11 @@ class HivemindGRPOTrainer:
         except AttributeError:
             pass
         self.node.clear_stage_cache()
+        clear_outputs_cache()
+
+    def _cuda_memory_pressured(self):
+        free, total = torch.cuda.mem_get_info()
+        return free / total < CUDA_FREE_MEMORY_THRESHOLD
 
     def train_and_save(self, trainer, train_dataset):
         for num_fails in range(MAX_TRAIN_FAILS):
@@ -208,7 +254,7 @@ class HivemindGRPOTrainer:
                 break
             except (BlockingIOError, EOFError) as e:
                 self.logger.warning(f"DHT IPC error: {e}. Restarting training...")
-                self.cleanup()  # Clear GPU/caches
+                self.cleanup(force=True)  # Clear GPU/caches
                 time.sleep(5)
                 continue
         metrics = train_result.metrics
@@ -227,9 +273,39 @@ class HivemindGRPOTrainer:
         self.tokenizer.save_pretrained(self.config.output_dir)
         self.logger.info(f"Tokenizer saved to {self.config.output_dir}")
 
-    def get_round_and_stage(self):
+    def _fetch_round_and_stage(self):
         return get_round_and_stage(self.dht)
 
+    def get_round_and_stage(self):
+        # Reuse a recent value so tight loops don't hit the DHT on every call.
+        now = time.monotonic()
+        if self._round_stage and now - self._round_stage[0] < self.round_stage_ttl:
+            return self._round_stage[1]
+
+        round_stage = self._fetch_round_and_stage()
+        self._round_stage = (now, round_stage)
+        return round_stage
+
+    def refresh_visible_maddrs(self):
+        # Forces a DHT refresh, but visible addresses rarely change; throttle it.
+        now = time.monotonic()
+        if now - self._last_maddrs_fetch > MADDRS_REFRESH_INTERVAL:
+            _ = self.dht.get_visible_maddrs(latest=True)
+            self._last_maddrs_fetch = now
+
+    def _wait_for_next_round(self, round_num, backoff, check_interval):
+        # Poll instead of sleeping blindly so a new round is joined promptly;
+        # jitter keeps followers from hitting the DHT in lockstep.
+        deadline = time.monotonic() + backoff + random.uniform(0, backoff * 0.2)
+        while (remaining := deadline - time.monotonic()) > 0:
+            time.sleep(min(check_interval, remaining))
+            try:
+                curr_round, _ = self.get_round_and_stage()
+            except Exception:
+                continue
+            if curr_round > round_num:
+                return
+
     def coordinator_train(self):
         round_num = 0
         start_time = time.monotonic()
@@ -239,7 +315,7 @@ class HivemindGRPOTrainer:
         ):
             self.logger.info(f"🤖 Starting new round: {round_num}")
 
-            _ = self.dht.get_visible_maddrs(latest=True)
+            self.refresh_visible_maddrs()
             self.train_stages(round_num, 0, is_coordinator=True)
 
             round_num += 1
@@ -250,7 +326,7 @@ class HivemindGRPOTrainer:
     def follower_train(
         self, check_interval=5.0, log_timeout=10.0, max_check_interval=60.0 * 5
     ):
-        done_rounds = set()
+        max_done_round = -1
         start_time = time.monotonic()
         fetch_log_time = start_time
         check_backoff = (
@@ -258,7 +334,7 @@ class HivemindGRPOTrainer:
         )
         while time.monotonic() - start_time < self.stage_data.train_timeout:
             curr_time = time.monotonic()
-            _ = self.dht.get_visible_maddrs(latest=True)
+            self.refresh_visible_maddrs()
 
             try:
                 round_num, stage = self.get_round_and_stage()
@@ -272,7 +348,7 @@ class HivemindGRPOTrainer:
                 time.sleep(check_interval)
                 continue
 
-            if round_num not in done_rounds:
+            if round_num > max_done_round:
                 self.logger.info(
                     f"🐝 Joining round: {round_num} starting at stage: {stage}"
                 )
@@ -285,13 +361,14 @@ class HivemindGRPOTrainer:
                     else:
                         raise
 
-                done_rounds.add(round_num)
+                max_done_round = round_num
                 check_backoff = check_interval
             else:
                 self.logger.info(
-                    f"Already finished round: {round_num}. Next check in {check_backoff}s."
+                    f"Already finished round: {round_num}. Checking every "
+                    f"{check_interval}s for up to ~{check_backoff}s (+jitter)."
                 )
-                time.sleep(check_backoff)
+                self._wait_for_next_round(round_num, check_backoff, check_interval)
                 check_backoff = min(check_backoff * 2, max_check_interval)
 
             if round_num == self.stage_data.max_rounds - 1:
@@ -304,31 +381,24 @@ class HivemindGRPOTrainer:
         补跑从 start_round 到 end_round的轮次。
         如果 end_round为None, 则补跑至当前轮次的前一轮。
         """
-        curr_round, _ = self.get_round_and_stage()
         if end_round is None:
+            curr_round, _ = self.get_round_and_stage()
             end_round = curr_round - 1
 
-            self.logger.info(f"开始补跑轮次, 从{start_round}到{end_round}")
-            done_rounds = set()
-
-            for round_num in range(start_round, end_round + 1):
-                if round_num in done_rounds:
-                    self.logger.info(f"轮次 {round_num} 已完成, 跳过")
-                    continue
+        self.logger.info(f"开始补跑轮次, 从{start_round}到{end_round}")
+        for round_num in range(start_round, end_round + 1):
+            self.logger.info(f"补跑轮次: {round_num}, 从  stage 0 开始")
+            try:
+                self.train_stages(round_num, 0, is_coordinator=False)
+                self.cleanup()
+            except datasets.exceptions.DatasetGenerationError as e:
+                self.logger.error(f"轮次 {round_num}  数据生成失败: {e}")
+                continue
+            except Exception as e:
+                self.logger.error(f"轮次 {round_num} 训练失败, 停止补跑: {e}")
+                break
 
-                self.logger.info(f"补跑轮次: {round_num}, 从  stage 0 开始")
-                try:
-                    self.train_stages(round_num, 0, is_coordinator=False)
-                    done_rounds.add(round_num)
-                    self.cleanup()
-                except datasets.exceptions.DatasetGenerationError as e:
-                    self.logger.error(f"轮次 {round_num}  数据生成失败: {e}")
-                    continue
-                except Exception as e:
-                    self.logger.error(f"轮次 {round_num} 训练失败: {e}")
-                    continue
-
-            self.logger.info(f"补跑完成, 从 {start_round} 到 {end_round}")
+        self.logger.info(f"补跑完成, 从 {start_round} 到 {end_round}")
 
     def train(self):
         try:
@@ -338,7 +408,7 @@ class HivemindGRPOTrainer:
                 curr_round, _ = self.get_round_and_stage()
                 if curr_round > 0:
                     self.catch_up_train(start_round=0, end_round=curr_round - 1)
-                    self.follower_train()
+                self.follower_train()
         except Exception:
             import traceback
             traceback.print_exc()
@@ -63,7 +63,7 @@ if [[ "$OSTYPE" == "darwin"* ]]; then
 else
     # 非Mac环境设置
     export CUDA_VISIBLE_DEVICES=0
-    export PYTORCH_CUDA_ALLOC_CONF=max_split_size_mb:512
+    export PYTORCH_CUDA_ALLOC_CONF=expandable_segments:True,max_split_size_mb:512
     export OMP_NUM_THREADS=4
     export MKL_NUM_THREADS=4
     ulimit -v 16000000
@@ -7,8 +7,9 @@ import time
 import uuid
 from abc import ABC, abstractmethod
 from collections import defaultdict
+from collections.abc import Mapping
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from hivemind.dht import DHT
 
@@ -39,6 +40,7 @@ class BaseDHTPublisher(ABC):
         logger: logging.Logger,
         poll_interval_seconds: int = 300,  # 5 minutes default
         coordinator: Optional[ModalSwarmCoordinator] = None,
+        on_update: Optional[Callable[[], None]] = None,
     ):
         """
         Initialize the DHT publisher.
@@ -49,12 +51,14 @@ class BaseDHTPublisher(ABC):
             logger: Logger instance
             poll_interval_seconds: How often to poll the DHT (in seconds)
             coordinator: The coordinator to get round and stage information from
+            on_update: Called when a poll observes new DHT data
         """
         self.dht = dht
         self.kinesis_client = kinesis_client
         self.logger = logger
         self.poll_interval_seconds = poll_interval_seconds
         self.coordinator = coordinator
+        self.on_update = on_update
 
         # Thread control
         self._stop_event = threading.Event()
@@ -102,14 +106,14 @@ class BaseDHTPublisher(ABC):
 
     def _get_rewards_data(
         self, round_num: int, stage_num: int
-    ) -> dict[str, Any] | None:
+    ) -> Mapping[str, Any] | None:
         rewards_key_str = rewards_key(round_num, stage_num)
         rewards_data = get_dht_value(self.dht, key=rewards_key_str, beam_size=500)
         return rewards_data
 
     def _get_outputs_data(
         self, node_key: str, round_num: int, stage_num: int
-    ) -> dict[str, Any] | None:
+    ) -> Mapping[str, Any] | None:
         outputs_key_str = outputs_key(node_key, round_num, stage_num)
         outputs_data = get_dht_value(self.dht, key=outputs_key_str)
         return outputs_data
@@ -117,6 +121,11 @@ class BaseDHTPublisher(ABC):
     def _get_peer_name_from_id(self, peer_id: str) -> str:
         return get_name_from_peer_id(peer_id) or peer_id
 
+    def _notify_update(self):
+        """Signal listeners that this poll observed new DHT data."""
+        if self.on_update:
+            self.on_update()
+
     def _poll_loop(self):
         """Main polling loop."""
 
@@ -156,10 +165,16 @@ class RewardsDHTPublisher(BaseDHTPublisher):
         logger=None,
         poll_interval_seconds: int = 300,
         coordinator=None,
+        on_update=None,
     ):
         """Initialize the publisher."""
         super().__init__(
-            dht, kinesis_client, logger, poll_interval_seconds, coordinator=coordinator
+            dht,
+            kinesis_client,
+            logger,
+            poll_interval_seconds,
+            coordinator=coordinator,
+            on_update=on_update,
         )
 
     def _poll_once(self):
@@ -210,6 +225,7 @@ class RewardsDHTPublisher(BaseDHTPublisher):
                 # Update current round and stage
                 self.current_round = new_round
                 self.current_stage = new_stage
+                self._notify_update()
                 self.logger.info(
                     "Updated round/stage to new values",
                     extra={
@@ -351,11 +367,19 @@ class GossipDHTPublisher(BaseDHTPublisher):
         logger=None,
         poll_interval_seconds: int = 300,
         coordinator=None,
+        on_update=None,
     ):
         """Initialize the publisher."""
         super().__init__(
-            dht, kinesis_client, logger, poll_interval_seconds, coordinator=coordinator
+            dht,
+            kinesis_client,
+            logger,
+            poll_interval_seconds,
+            coordinator=coordinator,
+            on_update=on_update,
         )
+        # Gossip IDs seen on the previous poll; only new ones signal an update.
+        self._gossip_ids: set[str] = set()
 
     def _poll_once(self):
         """Perform a single poll of the DHT for gossip data."""
@@ -430,6 +454,10 @@ class GossipDHTPublisher(BaseDHTPublisher):
                     if node_gossip_count[node_key] > node_gossip_limit:
                         break
 
+            gossip_ids = {msg["id"] for _, msg in round_gossip}
+            if gossip_ids - self._gossip_ids:
+                self._notify_update()
+            self._gossip_ids = gossip_ids
             self._publish_gossip(round_gossip)
 
         except Exception as e:
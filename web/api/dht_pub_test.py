@@ -158,6 +158,25 @@ class TestRewardsDHTPublisher:
         # Check that last_polled was updated
         assert self.publisher.last_polled is not None
 
+    def test_poll_once_notifies_on_change(self):
+        """Test that on_update fires only when the round/stage changes."""
+        self.publisher.on_update = MagicMock()
+        self.publisher._publish_rewards = MagicMock()
+        self.coordinator.get_round_and_stage.return_value = (2, 1)
+        self.publisher.current_round = 1
+        self.publisher.current_stage = 1
+
+        self.publisher._poll_once()
+        self.publisher.on_update.assert_called_once()
+
+        # Unchanged round/stage does not notify again.
+        self.publisher._poll_once()
+        self.publisher.on_update.assert_called_once()
+
+        self.coordinator.get_round_and_stage.return_value = (2, 2)
+        self.publisher._poll_once()
+        assert self.publisher.on_update.call_count == 2
+
     def test_poll_once_error(self, caplog):
         """Test polling when there's an error."""
         # Set up the coordinator mock to raise an exception
@@ -440,6 +459,25 @@ class TestGossipDHTPublisher:
         # Check that last_polled was updated
         assert self.publisher.last_polled is not None
 
+    def test_poll_once_notifies_on_new_gossip(self):
+        """Test that on_update fires only when a poll finds new gossip."""
+        self.publisher.on_update = MagicMock()
+        self.coordinator.get_round_and_stage.return_value = (0, 0)
+        self.publisher._get_rewards_data = MagicMock(return_value={"peer_id_1": 0.5})
+        outputs = {"q_hash_1": (1.0, {"question": "q1", "answer": "a1"})}
+        self.publisher._get_outputs_data = MagicMock(return_value=outputs)
+
+        self.publisher._poll_once()
+        self.publisher.on_update.assert_called_once()
+
+        # Same gossip as the last poll does not notify again.
+        self.publisher._poll_once()
+        self.publisher.on_update.assert_called_once()
+
+        outputs["q_hash_2"] = (2.0, {"question": "q2", "answer": "a2"})
+        self.publisher._poll_once()
+        assert self.publisher.on_update.call_count == 2
+
     def test_poll_once_error(self, caplog):
         """Test polling when there's an error."""
         # Set the caplog level to capture ERROR messages
@@ -1,11 +1,20 @@
 import re
 
 TAGGED_PATTERN_TEMPLATE = r"<{0}>\n*(.*?)\n*</{0}>"
+# Tags the gossip messages extract, compiled once.
+TAGGED_PATTERNS = {
+    tag: re.compile(TAGGED_PATTERN_TEMPLATE.format(tag))
+    for tag in ("explain", "identify", "summarize_feedback", "majority")
+}
 
 
 def _extract_tagged(text, tag):
-    matches = re.findall(TAGGED_PATTERN_TEMPLATE.format(tag), text)
-    return matches[0]
+    pattern = TAGGED_PATTERNS.get(tag)
+    if pattern is None:
+        pattern = re.compile(TAGGED_PATTERN_TEMPLATE.format(tag))
+    if match := pattern.search(text):
+        return match.group(1)
+    raise ValueError(f"missing <{tag}> tag")
 
 
 def stage1_message(node_key: str, question: str, ts, outputs: dict):
@@ -0,0 +1,44 @@
+import pytest
+
+from .gossip_utils import _extract_tagged, stage2_message, stage3_message
+
+
+def test_extract_tagged_first_match_wins():
+    text = "<explain>\na\n</explain> <explain>b</explain>"
+    assert _extract_tagged(text, "explain") == "a"
+
+
+def test_extract_tagged_nested():
+    text = "<identify>x <explain>a</explain></identify> <explain>b</explain>"
+    assert _extract_tagged(text, "explain") == "a"
+    assert _extract_tagged(text, "identify") == "x <explain>a</explain>"
+
+
+def test_extract_tagged_missing():
+    with pytest.raises(ValueError):
+        _extract_tagged("<explain>a", "explain")
+
+
+def test_stage2_message():
+    outputs = {
+        "answer": "42",
+        "agent_opinion": {
+            "node": "<identify>x <explain>a</explain></identify> <explain>b</explain>"
+        },
+    }
+    expected = "a...Identify: x <explain>a</explain>"
+    assert stage2_message("node", "q", 0, outputs) == expected
+    assert stage2_message("other", "q", 0, outputs) == "q...Answer: 42"
+
+
+def test_stage3_message():
+    outputs = {
+        "answer": "42",
+        "final_agent_decision": {
+            "node": "<summarize_feedback> s </summarize_feedback><majority>1</majority>"
+            "<majority>2</majority>",
+            "bad": "<majority>1</majority>",
+        },
+    }
+    assert stage3_message("node", "q", 0, outputs) == "s...Majority: 1"
+    assert stage3_message("bad", "q", 0, outputs) == "q...Answer: 42"
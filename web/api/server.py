@@ -1,16 +1,20 @@
 import argparse
-import json
+import atexit
+import hashlib
 import logging
 import os
-import time
+import queue
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 from threading import Thread
 
 import aiofiles
 import httpx
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException, Query, Request, Response
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pythonjsonlogger import jsonlogger
 
@@ -27,14 +31,21 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DIST_DIR = os.path.join(BASE_DIR, "ui", "dist")
 
 index_html = None
+index_etag = None
+
+# Longest wait between cache polls; matches the old fixed interval so
+# publisher updates can only make the cache fresher.
+CACHE_POLL_FALLBACK_SECONDS = 10
 
 
 async def load_index_html():
-    global index_html
+    global index_html, index_etag
     if index_html is None:
         index_path = os.path.join(BASE_DIR, "ui", "dist", "index.html")
-        async with aiofiles.open(index_path, mode="r") as f:
-            index_html = await f.read()
+        async with aiofiles.open(index_path, mode="rb") as f:
+            content = await f.read()
+        index_etag = f'"{hashlib.md5(content).hexdigest()}"'
+        index_html = content
 
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
@@ -48,19 +59,44 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
                 log_record[key] = value
 
 
+class InProcessQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Records never leave the process, so skip the default pre-formatting and
+        # let the listener's formatter see the original args and exc_info.
+        return record
+
+
 json_formatter = CustomJsonFormatter("%(asctime)s %(levelname)s %(message)s")
 
 # Configure the root logger
+# Records are formatted and written by a listener thread, so request
+# handlers never block on stderr.
 root_logger = logging.getLogger()
 handler = logging.StreamHandler()
 handler.setFormatter(json_formatter)
-root_logger.addHandler(handler)
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+root_logger.addHandler(InProcessQueueHandler(log_queue))
 root_logger.setLevel(logging.INFO)
 
 # Get the module logger
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The dev proxy shares one client, and its connection pool, across requests.
+    if os.getenv("API_ENV") == "dev":
+        app.state.http_client = httpx.AsyncClient(
+            base_url="http://localhost:5173", timeout=10
+        )
+    yield
+    if client := getattr(app.state, "http_client", None):
+        await client.aclose()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 port = os.getenv("SWARM_UI_PORT", "8000")
 
 try:
@@ -84,7 +120,7 @@ server = uvicorn.Server(config)
 @app.exception_handler(Exception)
 async def internal_server_error_handler(request: Request, exc: Exception):
     logger.error(f"Internal server error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal Server Error",
@@ -121,50 +157,40 @@ def get_round_and_stage():
 
 @app.get("/api/leaderboard")
 def get_leaderboard():
-    leaderboard = global_dht.dht_cache.get_leaderboard()
-    res = dict(leaderboard)
-
-    if res is not None:
-        return {
-            "leaders": res.get("leaders", []),
-            "total": res.get("total", 0),
-        }
+    return Response(
+        content=global_dht.dht_cache.get_snapshot().leaders,
+        media_type="application/json",
+    )
 
 
 @app.get("/api/leaderboard-cumulative")
 def get_leaderboard_cumulative():
-    leaderboard = global_dht.dht_cache.get_leaderboard_cumulative()
-    res = dict(leaderboard)
-
-    if res is not None:
-        return {
-            "leaders": res.get("leaders", []),
-            "total": res.get("total", 0),
-        }
-    else:
-        return {
-            "leaders": [],
-            "total": 0,
-        }
+    return Response(
+        content=global_dht.dht_cache.get_snapshot().cumulative,
+        media_type="application/json",
+    )
 
 
 @app.get("/api/rewards-history")
 def get_rewards_history():
-    leaderboard = global_dht.dht_cache.get_leaderboard()
-    res = dict(leaderboard)
-
-    if res is not None:
-        return {
-            "leaders": res.get("rewardsHistory", []),
-        }
+    return Response(
+        content=global_dht.dht_cache.get_snapshot().rewards_history,
+        media_type="application/json",
+    )
 
 
 @app.get("/api/name-to-id")
 def get_id_from_name(name: str = Query("")):
     leaderboard = global_dht.dht_cache.get_leaderboard()
-    leader_ids = [leader["id"] for leader in leaderboard["leaders"]] or []
-
-    peer_id = search_peer_ids_for_name(leader_ids, name)
+    # Leaders carry nicknames computed at poll time; no need to hash IDs again.
+    peer_id = next(
+        (
+            leader["id"]
+            for leader in leaderboard["leaders"]
+            if leader["nickname"] == name
+        ),
+        None,
+    )
     return {
         "id": peer_id,
     }
@@ -181,15 +207,14 @@ async def id_to_name(request: Request):
 
     # Parse request body
     try:
-        body = await request.json()
-        if not isinstance(body, list):
-            raise HTTPException(
-                status_code=400, detail="Request body must be a list of peer IDs"
-            )
-    except json.JSONDecodeError as e:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=400, detail="Request body must be a list of peer IDs"
+        )
 
     # Validate input size
     if len(body) > 1000:  # Limit number of IDs that can be processed
@@ -197,23 +222,22 @@ async def id_to_name(request: Request):
             status_code=400, detail="Too many peer IDs. Maximum is 1000."
         )
 
-    # Process each ID
-    id_to_name_map = {}
-    for peer_id in body:
-        try:
-            name = get_name_from_peer_id(peer_id)
-            if name is not None:
-                id_to_name_map[peer_id] = name
-        except Exception as e:
-            logger.error(f"Error looking up name for peer ID {peer_id}: {str(e)}")
+    # Non-string entries can never resolve to a name.
+    peer_ids = [p for p in body if isinstance(p, str)]
+    if len(peer_ids) < len(body):
+        logger.warning(f"Ignoring {len(body) - len(peer_ids)} non-string peer IDs")
 
-    return id_to_name_map
+    # Process each unique ID; orjson rejects invalid UTF-8, so every string
+    # here hashes cleanly.
+    return {
+        peer_id: get_name_from_peer_id(peer_id)
+        for peer_id in dict.fromkeys(peer_ids)
+    }
 
 
 @app.get("/api/gossip")
 def get_gossip():
-    gs = global_dht.dht_cache.get_gossips()
-    return dict(gs)
+    return global_dht.dht_cache.get_gossips()
 
 
 if os.getenv("API_ENV") != "dev":
@@ -232,6 +256,15 @@ if os.getenv("API_ENV") != "dev":
     )
 
 
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison: proxies that compress responses rewrite tags to W/"...".
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+
 @app.get("/{full_path:path}")
 async def catch_all(full_path: str, request: Request):
     # Development reverse proxies to ui dev server
@@ -239,30 +272,26 @@ async def catch_all(full_path: str, request: Request):
         logger.info(
             f"proxying {full_path} into local UI development environment on 5173..."
         )
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                url=f"http://localhost:5173/{full_path}", headers=request.headers
-            )
-            headers = {
-                k: v
-                for k, v in resp.headers.items()
-                if k.lower() not in ["content-length", "transfer-encoding"]
-            }
-            return Response(
-                content=resp.content, status_code=resp.status_code, headers=headers
-            )
+        resp = await request.app.state.http_client.get(
+            f"/{full_path}", headers=request.headers
+        )
+        headers = {
+            k: v
+            for k, v in resp.headers.items()
+            if k.lower() not in ["content-length", "transfer-encoding"]
+        }
+        return Response(
+            content=resp.content, status_code=resp.status_code, headers=headers
+        )
 
     # Live environment (serve from dist)
-    # We don't want to cache index.html, but other static assets are fine to cache.
+    # index.html is always revalidated; unchanged copies get a bodiless 304.
     await load_index_html()
-    return HTMLResponse(
-        content=index_html,
-        headers={
-            "Cache-Control": "no-store, no-cache, must-revalidate, proxy-revalidate",
-            "Pragma": "no-cache",
-            "Expires": "0",
-        },
-    )
+    headers = {"ETag": index_etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match", ""), index_etag):
+        return Response(status_code=304, headers=headers)
+
+    return HTMLResponse(content=index_html, headers=headers)
 
 
 def parse_arguments():
@@ -279,8 +308,9 @@ def populate_cache():
         while True:
             logger.info("pulling latest dht data...")
             global_dht.dht_cache.poll_dht()
-            time.sleep(10)
             logger.info("dht polled")
+            # Publishers wake us early on new data; otherwise poll as before.
+            global_dht.dht_cache.wait_dirty(timeout=CACHE_POLL_FALLBACK_SECONDS)
     except Exception as e:
         logger.error("uncaught exception while polling dht", e)
 
@@ -311,6 +341,7 @@ def main(args):
         logger=logger,
         coordinator=coordinator,
         poll_interval_seconds=300,  # 5 minute
+        on_update=global_dht.dht_cache.mark_dirty,
     )
     rewards_publisher.start()
 
@@ -321,6 +352,7 @@ def main(args):
         logger=logger,
         coordinator=coordinator,
         poll_interval_seconds=150,  # 2.5 minute
+        on_update=global_dht.dht_cache.mark_dirty,
     )
     gossip_publisher.start()
 
@@ -1,9 +1,13 @@
 import hashlib
 import itertools
 import random
-from collections import defaultdict
+import threading
+from collections import defaultdict, namedtuple
+from collections.abc import Mapping
 from datetime import datetime, timezone
 
+import orjson
+
 from hivemind_exp.dht_utils import *
 from hivemind_exp.name_utils import get_name_from_peer_id
 
@@ -16,6 +20,11 @@ from .kinesis import (
     RewardsMessageData,
 )
 
+# Pre-serialized leaderboard API responses, swapped in as one object by the poller.
+LeaderboardSnapshot = namedtuple(
+    "LeaderboardSnapshot", ["leaders", "cumulative", "rewards_history"]
+)
+
 
 class Cache:
     def __init__(self, dht, coordinator, manager, logger, kinesis_client):
@@ -26,14 +35,23 @@ class Cache:
         self.logger = logger
         self.kinesis_client = kinesis_client
         self.lock = manager.Lock()
+        # Set when a publisher sees new DHT data; wakes the polling thread early.
+        self._dirty = threading.Event()
         self.reset()
 
     def reset(self):
         self.leaderboard = self.manager.dict()
         self.leaderboard_v2 = self.manager.dict()  # Cumulative rewards leaderboard.
 
+        # Pre-serialized API responses; rebuilt only when a poll updates them.
+        self.snapshot = LeaderboardSnapshot(
+            leaders=orjson.dumps({"leaders": [], "total": 0}),
+            cumulative=orjson.dumps({"leaders": [], "total": 0}),
+            rewards_history=orjson.dumps({"leaders": []}),
+        )
+
         self.rewards_history = self.manager.dict()
-        self.gossips = self.manager.dict()
+        self.gossips = {"messages": []}
 
         self.current_round = self.manager.Value("i", -1)
         self.current_stage = self.manager.Value("i", -1)
@@ -49,12 +67,25 @@ class Cache:
     def get_leaderboard_cumulative(self):
         return dict(self.leaderboard_v2)
 
+    def get_snapshot(self) -> LeaderboardSnapshot:
+        # Replaced wholesale (by polls and reset), never mutated; reads need no lock.
+        return self.snapshot
+
     def get_gossips(self, since_round=0):
-        return dict(self.gossips)
+        # The poller rebinds a fresh dict rather than mutating it, so no copy is needed.
+        return self.gossips
 
     def get_last_polled(self):
         return self.last_polled
 
+    def mark_dirty(self):
+        self._dirty.set()
+
+    def wait_dirty(self, timeout):
+        """Blocks until marked dirty or timeout elapses, then clears the flag."""
+        self._dirty.wait(timeout=timeout)
+        self._dirty.clear()
+
     def poll_dht(self):
         try:
             self._get_round_and_stage()
@@ -70,6 +101,17 @@ class Cache:
     def _get_dht_value(self, beam_size=100, **kwargs):
         return get_dht_value(self.dht, beam_size=beam_size, **kwargs)
 
+    def _iter_dht_values(self, keys, window=8, beam_size=100):
+        # Keep a window of lookups in flight and yield results in key order.
+        for i in range(0, len(keys), window):
+            batch = keys[i : i + window]
+            futures = [
+                self.dht.get(key, beam_size=beam_size, return_future=True)
+                for key in batch
+            ]
+            for key, future in zip(batch, futures):
+                yield key, unwrap_dht_value(future.result())
+
     def _get_round_and_stage(self):
         try:
             r, s = self.coordinator.get_round_and_stage()
@@ -93,7 +135,7 @@ class Cache:
 
         return max(0, r), max(0, s)
 
-    def _current_rewards(self) -> dict[str, Any] | None:
+    def _current_rewards(self) -> Mapping[str, Any] | None:
         # Basically a proxy for the reachable peer group.
         curr_round = self.current_round.value
         curr_stage = self.current_stage.value
@@ -198,6 +240,9 @@ class Cache:
                     "leaders": sorted_leaders,
                     "total": len(sorted_leaders),
                 }
+                self.snapshot = self.snapshot._replace(
+                    cumulative=orjson.dumps(self.leaderboard_v2)
+                )
 
                 # Convert to RewardsMessage format and send to Kinesis
                 # self._send_rewards_to_kinesis(sorted_leaders, curr_round, curr_stage)
@@ -308,6 +353,10 @@ class Cache:
                     "total": len(raw),
                     "rewardsHistory": current_history,
                 }
+                self.snapshot = self.snapshot._replace(
+                    leaders=orjson.dumps({"leaders": all_entries, "total": len(raw)}),
+                    rewards_history=orjson.dumps({"leaders": current_history}),
+                )
         except Exception as e:
             self.logger.warning("could not get leaderboard data: %s", e)
 
@@ -333,10 +382,18 @@ class Cache:
             node_gossip_limit = max(1, MESSAGE_TARGET / len(nodes))
 
             start_round = max(0, curr_round - 3)
-            for r, s, node_key in itertools.product(
-                reversed(range(start_round, curr_round + 1)),  # Most recent first
-                reversed(range(0, 3)),
-                nodes,
+            candidates = [
+                (r, s, node_key)
+                for r, s, node_key in itertools.product(
+                    reversed(range(start_round, curr_round + 1)),  # Most recent first
+                    reversed(range(0, 3)),
+                    nodes,
+                )
+                if not (r == curr_round and s > curr_stage)
+            ]
+            keys = [outputs_key(node_key, r, s) for r, s, node_key in candidates]
+            for (r, s, node_key), (_, outputs) in zip(
+                candidates, self._iter_dht_values(keys)
             ):
                 # Check if we've exceeded 10 seconds
                 # Adding this as a stop gap to make sure the gossip collection doesn't stop other data from being polled.
@@ -344,13 +401,10 @@ class Cache:
                     self.logger.warning(">>> gossip collection timed out after 10s")
                     break
 
-                if r == curr_round and s > curr_stage:
-                    continue
-
                 if node_gossip_count[node_key] > node_gossip_limit:
                     break
 
-                if outputs := self._get_dht_value(key=outputs_key(node_key, r, s)):
+                if outputs:
                     sorted_outputs = sorted(
                         list(outputs.items()), key=lambda t: t[1][0]
                     )
@@ -393,8 +447,6 @@ class Cache:
 
         # self._send_gossip_to_kinesis(round_gossip)
 
-        with self.lock:
-            self.gossips = {
-                "messages": [msg for _, msg in sorted(round_gossip, reverse=True)]
-                or [],
-            }
+        self.gossips = {
+            "messages": [msg for _, msg in sorted(round_gossip, reverse=True)],
+        }
@@ -0,0 +1,33 @@
+import logging
+import threading
+import time
+from unittest.mock import MagicMock
+
+from .server_cache import Cache
+
+logger = logging.getLogger(__name__)
+
+
+def create_cache():
+    return Cache(MagicMock(), MagicMock(), MagicMock(), logger, MagicMock())
+
+
+def test_wait_dirty_times_out():
+    cache = create_cache()
+    start = time.monotonic()
+    cache.wait_dirty(timeout=0.05)
+    assert time.monotonic() - start >= 0.05
+
+
+def test_mark_dirty_wakes_waiter():
+    cache = create_cache()
+    threading.Timer(0.05, cache.mark_dirty).start()
+
+    start = time.monotonic()
+    cache.wait_dirty(timeout=5)
+    assert time.monotonic() - start < 1
+
+    # The flag is cleared, so the next wait blocks again.
+    start = time.monotonic()
+    cache.wait_dirty(timeout=0.05)
+    assert time.monotonic() - start >= 0.05
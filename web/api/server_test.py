@@ -1,7 +1,9 @@
 import itertools
 import logging
+import multiprocessing
 import time
 import unittest
+from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
 from hivemind.utils import get_dht_time
@@ -10,6 +12,7 @@ from hivemind_exp.chain_utils import SwarmCoordinator
 from hivemind_exp.dht_utils import outputs_key, rewards_key
 
 from . import global_dht, server
+from .server_cache import Cache
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +34,124 @@ class DummySwarmCoordinator(SwarmCoordinator):
         return 3, 0
 
 
+class TestServerStatic(unittest.TestCase):
+    """Routes that don't touch the DHT cache."""
+
+    def setUp(self):
+        self.client = TestClient(server.app)
+
+    @patch.object(server, "index_etag", '"abc"')
+    @patch.object(server, "index_html", b"<html></html>")
+    def test_index_etag(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["etag"], '"abc"')
+        self.assertEqual(response.content, b"<html></html>")
+
+        for if_none_match in ('"abc"', 'W/"abc"', '"xyz", W/"abc"', "*"):
+            response = self.client.get(
+                "/leaderboard", headers={"If-None-Match": if_none_match}
+            )
+            self.assertEqual(response.status_code, 304, if_none_match)
+            self.assertEqual(response.headers["etag"], '"abc"')
+            self.assertEqual(response.content, b"")
+
+        response = self.client.get("/", headers={"If-None-Match": '"xyz"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_id_to_name(self):
+        response = self.client.post(
+            "/api/id-to-name",
+            json=["node_0", "node_1", "node_0", 7, None, {"id": "node_1"}],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "node_0": "freckled snorting raccoon",
+                "node_1": "deadly energetic raven",
+            },
+        )
+
+    def test_id_to_name_invalid(self):
+        for content in (b'["node_0"', b'{"id": "node_0"}', b'"node_0"'):
+            response = self.client.post("/api/id-to-name", content=content)
+            self.assertEqual(response.status_code, 400, content)
+
+        response = self.client.post(
+            "/api/id-to-name", json=[f"node_{i}" for i in range(1001)]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Too many peer IDs", response.json()["detail"])
+
+
+class TestServerLeaderboard(unittest.TestCase):
+    """Leaderboard endpoints served from the cache's pre-serialized snapshot."""
+
+    def setUp(self):
+        self.manager = multiprocessing.Manager()
+        self.dht_cache = Cache(
+            MagicMock(), DummySwarmCoordinator(), self.manager, logger, MagicMock()
+        )
+        self.dht_cache._current_rewards = MagicMock(
+            return_value={"node_0": 1.0, "node_1": 2.0}
+        )
+        patcher = patch.object(global_dht, "dht_cache", self.dht_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.manager.shutdown)
+
+        self.client = TestClient(server.app)
+
+    def get_bodies(self):
+        return [
+            self.client.get(path).json()
+            for path in (
+                "/api/leaderboard",
+                "/api/leaderboard-cumulative",
+                "/api/rewards-history",
+            )
+        ]
+
+    def test_empty(self):
+        self.assertEqual(
+            self.get_bodies(),
+            [{"leaders": [], "total": 0}, {"leaders": [], "total": 0}, {"leaders": []}],
+        )
+
+    def test_after_poll(self):
+        self.dht_cache._get_round_and_stage()
+        self.dht_cache._get_leaderboard()
+        self.dht_cache._get_leaderboard_v2()
+
+        leaderboard = self.dht_cache.get_leaderboard()
+        cumulative = self.dht_cache.get_leaderboard_cumulative()
+        self.assertEqual(
+            self.get_bodies(),
+            [
+                {"leaders": leaderboard["leaders"], "total": leaderboard["total"]},
+                {"leaders": cumulative["leaders"], "total": cumulative["total"]},
+                {"leaders": leaderboard["rewardsHistory"]},
+            ],
+        )
+
+        leaders, cumulative_leaders, history = (
+            body["leaders"] for body in self.get_bodies()
+        )
+        self.assertEqual([l["id"] for l in leaders], ["node_1", "node_0"])
+        self.assertEqual(leaders[0]["nickname"], "deadly energetic raven")
+        self.assertEqual([l["score"] for l in leaders], [2.0, 1.0])
+        self.assertEqual([l["id"] for l in cumulative_leaders], ["node_1", "node_0"])
+        self.assertEqual([l["cumulativeScore"] for l in cumulative_leaders], [2.0, 1.0])
+        self.assertEqual([h["id"] for h in history], ["node_1", "node_0"])
+        self.assertEqual(len(history[0]["values"]), 1)
+
+
 class TestServer(unittest.TestCase):
     def setUp(self):
-        global_dht.setup_global_dht([], DummySwarmCoordinator(), logger)
+        global_dht.setup_global_dht(
+            [], DummySwarmCoordinator(), logger, kinesis_client=MagicMock()
+        )
         assert global_dht.dht
         assert global_dht.dht_cache
         self.dht = global_dht.dht